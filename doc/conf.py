@@ -9,7 +9,7 @@
 project = "eflips-model"
 copyright = "2024, Technische Universität Berlin"
 author = "Ludger Heide"
-release = "6.0.1"
+release = "6.1.0"
 
 
 # -- General configuration ---------------------------------------------------
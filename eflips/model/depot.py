@@ -77,7 +77,7 @@ class Plan(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the plan. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"))
+    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), index=True)
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="plans")
     """The scenario this plan belongs to."""
@@ -138,7 +138,7 @@ class Area(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the area. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"))
+    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), index=True)
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="areas")
     """The scenario this area belongs to."""
@@ -206,7 +206,7 @@ class Process(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the process. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"))
+    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), index=True)
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="processes")
     """The scenario."""
@@ -275,7 +275,7 @@ class AssocPlanProcess(Base):
     id = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the association. Auto-incremented. Needed for django."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"))
+    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), index=True)
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship(
         "Scenario", back_populates="assoc_plan_processes"
@@ -2,10 +2,10 @@ import uuid
 import warnings
 from datetime import datetime, timedelta
 from enum import auto, Enum as PyEnum
-from itertools import product
 from typing import Any, Dict, List, TYPE_CHECKING, Union
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from sqlalchemy import (
     BigInteger,
@@ -509,7 +509,7 @@ class VehicleType(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the vehicle type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"))
+    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), index=True)
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped[Scenario] = relationship(
         "Scenario", back_populates="vehicle_types"
@@ -692,7 +692,9 @@ class BatteryType(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped[Scenario] = relationship(
         "Scenario", back_populates="battery_types"
@@ -723,7 +725,9 @@ class Vehicle(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped[Scenario] = relationship("Scenario", back_populates="vehicles")
     """The scenario."""
@@ -770,7 +774,9 @@ class VehicleClass(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped[Scenario] = relationship(
         "Scenario", back_populates="vehicle_classes"
@@ -1046,8 +1052,11 @@ class ConsumptionLut(Base):
 
     @staticmethod
     def calc_consumption(
-        trip_distance: float, temperature: float, mass: float, duration: float
-    ) -> float:
+        trip_distance: float | npt.NDArray[np.float64],
+        temperature: float | npt.NDArray[np.float64],
+        mass: float | npt.NDArray[np.float64],
+        duration: float | npt.NDArray[np.float64],
+    ) -> float | npt.NDArray[np.float64]:
         """
         This function calculates the consumption of the trip according to the model of
         Ji, Bie, Zeng, Wang https://doi.org/10.1016/j.commtr.2022.100069
@@ -1056,6 +1065,9 @@ class ConsumptionLut(Base):
         :param mass: Curb weight + passengers in kg
         :param duration: Trip time in minutes
         :return: Trip energy in kWh
+
+        The parameters may also be NumPy arrays of the same shape. Then the consumption is calculated element-wise and
+        an array is returned.
         """
 
         # Calculate trip energy for traction and BTMS w1
@@ -1066,7 +1078,7 @@ class ConsumptionLut(Base):
             + 0.353 * np.log(duration)
             + 0.008 * np.abs(temperature - 23.7)
         )
-        w1: float = np.exp(term)
+        w1 = np.exp(term)
 
         # Calculate trip energy for AC w2
         # Possible enhancment: Derive a formula for how t_AC_percent is changing over temperature
@@ -1075,10 +1087,7 @@ class ConsumptionLut(Base):
         t_AC_percent = (
             1  # Percentage of how long of the trip heating/cooling is turned ON
         )
-        if temperature >= AC_threshold:
-            k = ks[0]
-        else:
-            k = ks[1]
+        k = np.where(temperature >= AC_threshold, ks[0], ks[1])
         w2 = k * t_AC_percent * duration
 
         # Total trip energy
@@ -1124,30 +1133,30 @@ class ConsumptionLut(Base):
         # Incline
         incline = 0
 
-        # Calculate consumption
-        combinations = list(product(temperatures, speeds, level_of_loading))
-
-        consumption_list = []
-        for combo in combinations:
-            temp, speed, lol = combo
-            duration = distance / speed * 60
-            mass = (lol + 1) * delta_mass
-            consumption = ConsumptionLut.calc_consumption(
-                distance, temp, mass, duration  # type: ignore
+        # Calculate consumption for all combinations at once. Flattening an "ij"-indexed grid yields the
+        # combinations in the same order as itertools.product would
+        temperature_grid, speed_grid, level_of_loading_grid = (
+            grid.ravel()
+            for grid in np.meshgrid(
+                temperatures, speeds, level_of_loading, indexing="ij"
             )
-            consumption_list.append(consumption)
+        )
+        duration_grid = distance / speed_grid * 60
+        mass_grid = (level_of_loading_grid + 1) * delta_mass
+        consumption_grid = ConsumptionLut.calc_consumption(
+            distance, temperature_grid, mass_grid, duration_grid
+        )
 
         # Create table and return
         consumption_table = pd.DataFrame(
-            combinations,
-            columns=[
-                ConsumptionLut.T_AMB,
-                ConsumptionLut.SPEED,
-                ConsumptionLut.LEVEL_OF_LOADING,
-            ],
+            {
+                ConsumptionLut.T_AMB: temperature_grid,
+                ConsumptionLut.SPEED: speed_grid,
+                ConsumptionLut.LEVEL_OF_LOADING: level_of_loading_grid,
+            }
         )
         consumption_table[ConsumptionLut.INCLINE] = incline
-        consumption_table[ConsumptionLut.CONSUMPTION] = consumption_list
+        consumption_table[ConsumptionLut.CONSUMPTION] = consumption_grid
 
         return consumption_table
 
@@ -0,0 +1,240 @@
+"""6.1.0
+
+Revision ID: 44e377d5887f
+Revises: 37ece7aa1742
+Create Date: 2026-10-16 10:12:41.183209
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "44e377d5887f"
+down_revision: Union[str, None] = "37ece7aa1742"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The indexes are built concurrently so that existing databases stay writable while they are created.
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, hence the autocommit block. As a consequence, an
+    # interrupted upgrade is not rolled back. The indexes that were already built are skipped when it is retried, but
+    # a concurrent build that failed leaves an INVALID index behind, which has to be dropped by hand before retrying.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_Area_scenario_id"),
+            "Area",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_AssocPlanProcess_scenario_id"),
+            "AssocPlanProcess",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_AssocRouteStation_scenario_id"),
+            "AssocRouteStation",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_BatteryType_scenario_id"),
+            "BatteryType",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Line_scenario_id"),
+            "Line",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Plan_scenario_id"),
+            "Plan",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Process_scenario_id"),
+            "Process",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Rotation_scenario_id"),
+            "Rotation",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Route_scenario_id"),
+            "Route",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Station_scenario_id"),
+            "Station",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_StopTime_scenario_id"),
+            "StopTime",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Trip_scenario_id"),
+            "Trip",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_Vehicle_scenario_id"),
+            "Vehicle",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_VehicleClass_scenario_id"),
+            "VehicleClass",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            op.f("ix_VehicleType_scenario_id"),
+            "VehicleType",
+            ["scenario_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_VehicleType_scenario_id"),
+            table_name="VehicleType",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_VehicleClass_scenario_id"),
+            table_name="VehicleClass",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Vehicle_scenario_id"),
+            table_name="Vehicle",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Trip_scenario_id"),
+            table_name="Trip",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_StopTime_scenario_id"),
+            table_name="StopTime",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Station_scenario_id"),
+            table_name="Station",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Route_scenario_id"),
+            table_name="Route",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Rotation_scenario_id"),
+            table_name="Rotation",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Process_scenario_id"),
+            table_name="Process",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Plan_scenario_id"),
+            table_name="Plan",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Line_scenario_id"),
+            table_name="Line",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_BatteryType_scenario_id"),
+            table_name="BatteryType",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_AssocRouteStation_scenario_id"),
+            table_name="AssocRouteStation",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_AssocPlanProcess_scenario_id"),
+            table_name="AssocPlanProcess",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            op.f("ix_Area_scenario_id"),
+            table_name="Area",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -33,7 +33,9 @@ class Line(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="lines")
     """The scenario."""
@@ -63,7 +65,9 @@ class Route(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="routes")
     """The scenario."""
@@ -260,7 +264,9 @@ class Station(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="stations")
     """The scenario."""
@@ -385,7 +391,9 @@ class AssocRouteStation(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the association. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship(
         "Scenario", back_populates="assoc_route_stations"
@@ -37,7 +37,9 @@ class StopTime(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="stop_times")
     """The scenario."""
@@ -103,7 +105,9 @@ class Trip(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="trips")
     """The scenario."""
@@ -276,7 +280,9 @@ class Rotation(Base):
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     """The unique identifier of the battery type. Auto-incremented."""
 
-    scenario_id: Mapped[int] = mapped_column(ForeignKey("Scenario.id"), nullable=False)
+    scenario_id: Mapped[int] = mapped_column(
+        ForeignKey("Scenario.id"), nullable=False, index=True
+    )
     """The unique identifier of the scenario. Foreign key to :attr:`Scenario.id`."""
     scenario: Mapped["Scenario"] = relationship("Scenario", back_populates="rotations")
     """The scenario."""
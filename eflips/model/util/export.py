@@ -4,13 +4,15 @@
 Utility script to export a scenario to a file.
 """
 import gzip
+import io
 import os
 import pickle
 from argparse import ArgumentParser
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import Any, Dict, IO, Iterator, List, Tuple, Type
 
 import psycopg2
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, insert
 from sqlalchemy.orm import (
     class_mapper,
     make_transient,
@@ -69,6 +71,51 @@ ALL_PURE_ASSOC_CLASSES = [AssocAreaProcess, AssocVehicleTypeVehicleClass]
 ALL_TABLE_CLASSES = ALL_CLASSES_WITH_SCENARIO_ID + ALL_PURE_ASSOC_CLASSES + [Scenario]
 
 
+ZSTD_MAGIC_NUMBER = b"\x28\xb5\x2f\xfd"
+"""The first four bytes of a Zstandard-compressed file."""
+
+
+@contextmanager
+def open_scenario_file(path: str, write: bool = False) -> Iterator[IO[bytes]]:
+    """
+    Open a file containing an exported scenario for reading or writing.
+
+    By default, the file is compressed with gzip. If the file name ends in ".zst", it is compressed with Zstandard
+    instead, which decompresses several times faster. When reading, the compression is detected from the first bytes
+    of the file, so both kinds of files can be imported. Zstandard support requires the optional `zstandard` package
+    (``pip install eflips-model[zstd]``).
+
+    :param path: The path of the file.
+    :param write: Whether to open the file for writing. Otherwise, it is opened for reading.
+    :return: A binary file object, to be used with :func:`pickle.load` or :func:`pickle.dump`.
+    """
+    with open(path, "wb" if write else "rb") as raw_file:
+        if write:
+            use_zstd = path.endswith(".zst")
+        else:
+            use_zstd = raw_file.read(len(ZSTD_MAGIC_NUMBER)) == ZSTD_MAGIC_NUMBER
+            raw_file.seek(0)
+
+        if use_zstd:
+            try:
+                import zstandard
+            except ImportError as e:
+                raise ImportError(
+                    "The 'zstandard' package is required for Zstandard-compressed scenario files. "
+                    "Install it with 'pip install eflips-model[zstd]'."
+                ) from e
+            if write:
+                with zstandard.ZstdCompressor().stream_writer(raw_file) as writer:
+                    yield writer
+            else:
+                with zstandard.ZstdDecompressor().stream_reader(raw_file) as reader:
+                    # pickle needs readline(), which the raw decompression stream does not provide
+                    yield io.BufferedReader(reader, buffer_size=256 * 1024)
+        else:
+            with gzip.open(raw_file, "wb" if write else "rb") as gzip_file:
+                yield gzip_file  # type: ignore
+
+
 def start_counting_foreign_keys_at(
     start: Dict[str, int], objs: List[Base]
 ) -> List[Base]:
@@ -81,48 +128,52 @@ def start_counting_foreign_keys_at(
     :return: The same list of Base objects, but with the foreign key IDs set to values >= the given start value.
     """
 
+    # Resolve the primary key and foreign key column names once per class, instead of once per object. The mapper
+    # introspection is by far the most expensive part of this function for large scenarios.
+    primary_key_names: Dict[Type[Base], str] = {}
+    foreign_key_columns: Dict[Type[Base], List[Tuple[str, str]]] = {}
+    for cls in {obj.__class__ for obj in objs}:
+        mapper = class_mapper(cls)
+        assert len(mapper.primary_key) == 1
+        primary_key_names[cls] = mapper.primary_key[0].name
+        foreign_key_columns[cls] = []
+        for relationship in mapper.relationships:
+            if relationship.direction in (
+                RelationshipDirection.ONETOMANY,
+                RelationshipDirection.MANYTOMANY,
+            ):
+                # We are on the remote side of a one-to-many relationship. No need to change anything.
+                continue
+            assert len(relationship.local_columns) == 1
+            foreign_key_columns[cls].append(
+                (
+                    next(iter(relationship.local_columns)).name,
+                    str(relationship.argument),
+                )
+            )
+
     # In a first pass, find how much we need to offset the IDs by
     # If e.g. our IDs range from 1 to 6, and the base is 10, we need to add 9 to each ID
-    offsets = {}
+    offsets: Dict[str, int] = {}
     for obj in objs:
-        assert len(class_mapper(obj.__class__).primary_key) == 1
-        primary_key_name = class_mapper(obj.__class__).primary_key[0].name
-        primary_key = obj.__dict__[primary_key_name]
+        primary_key = obj.__dict__[primary_key_names[obj.__class__]]
         if primary_key is None:
             raise ValueError(f"Primary key of {obj} is None.")
-        if obj.__class__.__name__ not in offsets:
-            offsets[obj.__class__.__name__] = (
-                start[obj.__class__.__name__] - primary_key
-            )
-        else:
-            offsets[obj.__class__.__name__] = max(
-                offsets[obj.__class__.__name__],
-                start[obj.__class__.__name__] - primary_key,
-            )
+        class_name = obj.__class__.__name__
+        offset = start[class_name] - primary_key
+        if class_name not in offsets or offset > offsets[class_name]:
+            offsets[class_name] = offset
 
     # In a second pass, set the IDs to the new values. Do that both if they are on the local or remote side of a
     # relationship.
     for obj in objs:
-        assert len(class_mapper(obj.__class__).primary_key) == 1
-        primary_key_name = class_mapper(obj.__class__).primary_key[0].name
-        primary_key = obj.__dict__[primary_key_name]
-        obj.__dict__[primary_key_name] = primary_key + offsets[obj.__class__.__name__]
+        obj_dict = obj.__dict__
+        primary_key_name = primary_key_names[obj.__class__]
+        obj_dict[primary_key_name] += offsets[obj.__class__.__name__]
 
-        for relationship in class_mapper(obj.__class__).relationships:
-            if relationship.direction in (
-                RelationshipDirection.ONETOMANY,
-                RelationshipDirection.MANYTOMANY,
-            ):
-                # We are on the remote side of a one-to-many relationship. No need to change anything.
-                continue
-            assert len(relationship.local_columns) == 1
-            relationship_column_name = next(iter(relationship.local_columns)).name
-            relationship_column = obj.__dict__[relationship_column_name]
-            if relationship_column is not None:
-                relationship_column = (
-                    relationship_column + offsets[str(relationship.argument)]
-                )
-                obj.__dict__[relationship_column_name] = relationship_column
+        for column_name, remote_class_name in foreign_key_columns[obj.__class__]:
+            if obj_dict[column_name] is not None:
+                obj_dict[column_name] += offsets[remote_class_name]
 
     return objs
 
@@ -154,7 +205,7 @@ def get_or_update_max_sequence_number(
                     f'ALTER SEQUENCE "{table_name + SEQUENCE_NUMBER_SUFFIX}" RESTART WITH {max_id + 1}'
                 )
                 cur.execute(
-                    f'SELECT NEXTVAL(\'"public"."{table_name + SEQUENCE_NUMBER_SUFFIX}"\')'
+                    f"SELECT NEXTVAL('\"{table_name + SEQUENCE_NUMBER_SUFFIX}\"')"
                 )
                 res = cur.fetchone()
                 new_max_id = res[0] if res is not None else None
@@ -166,6 +217,40 @@ def get_or_update_max_sequence_number(
     return result
 
 
+def insert_objects(session: Session, objs: List[Base]) -> None:
+    """
+    Insert a list of objects that are not attached to a session (such as the ones returned by
+    :func:`extract_scenario`) into the database.
+
+    Instead of adding them to the session one by one, the objects are grouped by class and each class is written with
+    a single bulk INSERT, in the order of the foreign key dependencies between the tables. This way, the INSERT
+    statement for each table is only built (and compiled) once, and the rows are sent in batches.
+
+    Note that the ORM-level consistency checks (``before_insert`` events) are not run for these objects, as they are
+    expected to come from a database where they already passed them.
+
+    :param session: An active database session.
+    :param objs: A list of Base objects. Their primary and foreign keys need to be set already.
+    :return: Nothing.
+    """
+    rows_by_class: Dict[Type[Base], List[Dict[str, Any]]] = {}
+    for obj in objs:
+        rows_by_class.setdefault(obj.__class__, []).append(obj.__dict__)
+
+    # The tables are written one after the other on the session's own connection. Spreading them over a pool of
+    # connections would not allow the import to be rolled back as a whole.
+    table_order = {table.name: i for i, table in enumerate(Base.metadata.sorted_tables)}
+    for cls in sorted(rows_by_class.keys(), key=lambda c: table_order[c.__tablename__]):
+        column_keys = [attr.key for attr in class_mapper(cls).column_attrs]
+        rows = [
+            {key: obj_dict[key] for key in column_keys if key in obj_dict}
+            for obj_dict in rows_by_class[cls]
+        ]
+        # render_nulls makes sure that None is written as NULL (instead of the server default) and keeps the columns
+        # identical for all rows, so they can be sent in one batch
+        session.execute(insert(cls).execution_options(render_nulls=True), rows)
+
+
 def disconnect_obj(obj: Base) -> Base:
     """
     Take an object and disconnect it from the database session. This will make it a pure Python object.
@@ -233,7 +318,8 @@ if __name__ == "__main__":
         "--output_file",
         "-o",
         type=str,
-        help="The file to which the scenario should be exported.",
+        help="The file to which the scenario should be exported. It is gzip-compressed, unless the name ends in "
+        "'.zst', in which case Zstandard compression is used (requires the 'zstandard' package).",
     )
     args.add_argument(
         "-s",
@@ -270,39 +356,37 @@ if __name__ == "__main__":
         )
 
     engine = create_engine(database_url)
+    # Nothing is ever committed here. Leaving the session closes it, which rolls back the transaction. This discards
+    # the changes extract_scenario() makes to the loaded objects.
     with Session(engine) as session:
-        try:
-            # Get the scenario ID. If it is not provied, load all scenarios.
-            if parsed.scenario_ids:
-                scenario_ids = parsed.scenario_ids
-            else:
-                scenario_id_result = session.query(Scenario.id)
-                scenario_ids = [result[0] for result in scenario_id_result]
-
-            if parsed.list:
-                for scenario_id in scenario_ids:
-                    scenario = (
-                        session.query(Scenario).filter(Scenario.id == scenario_id).one()
-                    )
-                    print(f"Scenario {scenario.id}: {scenario.name}")
-                exit(0)
+        # Get the scenario ID. If it is not provied, load all scenarios.
+        if parsed.scenario_ids:
+            scenario_ids = parsed.scenario_ids
+        else:
+            scenario_id_result = session.query(Scenario.id)
+            scenario_ids = [result[0] for result in scenario_id_result]
 
-            all_objects = []
+        if parsed.list:
             for scenario_id in scenario_ids:
-                all_objects.extend(extract_scenario(scenario_id, session))
+                scenario = (
+                    session.query(Scenario).filter(Scenario.id == scenario_id).one()
+                )
+                print(f"Scenario {scenario.id}: {scenario.name}")
+            exit(0)
 
-            # Get the alembic version
-            with session.connection().connection.driver_connection.cursor() as cur:  # type: ignore
-                cur.execute("SELECT * FROM alembic_version")
-                alembic_version_str = cur.fetchone()[0]
+        all_objects = []
+        for scenario_id in scenario_ids:
+            all_objects.extend(extract_scenario(scenario_id, session))
 
-            # Create a dictionary with the alembic version and the objects
-            to_dump = {"alembic_version": alembic_version_str, "objects": all_objects}
+        # Get the alembic version
+        with session.connection().connection.driver_connection.cursor() as cur:  # type: ignore
+            cur.execute("SELECT * FROM alembic_version")
+            alembic_version_str = cur.fetchone()[0]
 
-            # Write the objects to a compressed file.
-            with gzip.open(parsed.output_file, "wb") as file:
-                pickle.dump(to_dump, file)
+        # Create a dictionary with the alembic version and the objects
+        to_dump = {"alembic_version": alembic_version_str, "objects": all_objects}
 
-        finally:
-            session.rollback()
-            session.close()
+        # Write the objects to a compressed file. The protocol is pinned, so that the file has the same format on all
+        # supported Python versions and can be imported by any of them.
+        with open_scenario_file(parsed.output_file, write=True) as file:
+            pickle.dump(to_dump, file, protocol=5)
@@ -3,7 +3,6 @@
 """
 Utility script to import a scenario from a file.
 """
-import gzip
 import os
 import pickle
 from argparse import ArgumentParser
@@ -18,6 +17,8 @@ from eflips.model.util.export import (
     ALL_TABLE_CLASSES,
     start_counting_foreign_keys_at,
     get_or_update_max_sequence_number,
+    insert_objects,
+    open_scenario_file,
 )
 
 if __name__ == "__main__":
@@ -56,13 +57,12 @@ if __name__ == "__main__":
             "DATABASE_URL environment variable."
         )
 
-    with gzip.open(parsed.input_file, "rb") as file:
+    with open_scenario_file(parsed.input_file) as file:
         loaded: Dict[str, Union[List[Base], str]] = pickle.load(file)
 
+    # Non-Base entries are not checked one by one here, they are rejected by the mapper lookups further down
     all_objects = loaded["objects"]
     assert isinstance(all_objects, list)
-    for obj in all_objects:
-        assert isinstance(obj, Base)
     alembic_version_from_file = loaded["alembic_version"]
     assert isinstance(alembic_version_from_file, str)
 
@@ -71,37 +71,27 @@ if __name__ == "__main__":
     if parsed.create_schema:
         eflips.model.setup_database(engine)
 
-    with Session(engine) as session:
-        try:
-            # Validate the alembic version
-            with session.connection().connection.driver_connection.cursor() as cur:  # type: ignore
-                cur.execute("SELECT * FROM alembic_version")
-                alembic_version_from_db = cur.fetchone()[0]
-                if alembic_version_from_db != alembic_version_from_file:
-                    raise ValueError(
-                        f"Database alembic version ({alembic_version_from_db}) does not match the file's version "
-                        f"({alembic_version_from_file})."
-                    )
+    # The whole import is a single transaction. It is committed if everything succeeds and rolled back otherwise.
+    with Session(engine) as session, session.begin():
+        # Validate the alembic version
+        with session.connection().connection.driver_connection.cursor() as cur:  # type: ignore
+            cur.execute("SELECT * FROM alembic_version")
+            alembic_version_from_db = cur.fetchone()[0]
+            if alembic_version_from_db != alembic_version_from_file:
+                raise ValueError(
+                    f"Database alembic version ({alembic_version_from_db}) does not match the file's version "
+                    f"({alembic_version_from_file})."
+                )
 
-            # Find the maximum IDs in the database and update the sequence numbers
-            starts = get_or_update_max_sequence_number(session.connection().connection.driver_connection, do_update=False)  # type: ignore
-            all_objects = start_counting_foreign_keys_at(starts, all_objects)
+        # Find the maximum IDs in the database and update the sequence numbers
+        starts = get_or_update_max_sequence_number(session.connection().connection.driver_connection, do_update=False)  # type: ignore
+        all_objects = start_counting_foreign_keys_at(starts, all_objects)
 
-            # Put the objects into the database
-            with session.no_autoflush:
-                for obj in all_objects:
-                    session.add(obj)
-            session.flush()
+        # Put the objects into the database
+        insert_objects(session, all_objects)
 
-            # Update the sequence numbers in the database
-            get_or_update_max_sequence_number(
-                session.connection().connection.driver_connection,  # type: ignore
-                do_update=True,
-            )
-        except Exception as e:
-            print(e)
-            session.rollback()
-            raise
-        finally:
-            session.commit()
-            session.close()
+        # Update the sequence numbers in the database
+        get_or_update_max_sequence_number(
+            session.connection().connection.driver_connection,  # type: ignore
+            do_update=True,
+        )
@@ -0,0 +1,136 @@
+import importlib.resources
+import os
+from contextlib import contextmanager
+
+import pytest
+import sqlalchemy
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, event
+
+from eflips.model import Base, setup_database
+
+EXTENSION_LOCK_KEY = 4_815_162_342
+"""An arbitrary key for the advisory lock that serializes creating the extensions"""
+
+
+def worker_schema():
+    """
+    The schema the tests of this process run in
+    :return: The name of the pytest-xdist worker's schema, or None if the tests do not run in parallel
+    """
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    return f"test_{worker_id}" if worker_id is not None else None
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    Creates the engine for the test database, once per test run
+    :return: an SQLAlchemy Engine connected to the database in the DATABASE_URL environment variable
+    """
+    url = os.environ["DATABASE_URL"]
+
+    # The tests never commit, they run inside a transaction that is rolled back. The only commits are the ones
+    # building the schema once per run, which do not need to wait for the WAL to be flushed to disk
+    options = "-c synchronous_commit=off"
+
+    # When running in parallel with pytest-xdist, each worker gets a schema of its own, so that the workers do not
+    # drop each other's tables. The public schema stays on the search path for the PostGIS and btree_gist types.
+    schema = worker_schema()
+    if schema is not None:
+        options += f" -c search_path={schema},public"
+
+    engine = create_engine(
+        url,
+        echo=False,  # Change echo to True to see SQL queries
+        connect_args={"options": options},
+    )
+    if schema is not None:
+        # Start from an empty schema. Tables left over from an earlier run are dropped with it, instead of being
+        # looked up through the search path (which would also find the tables of a serial run in public)
+        with engine.begin() as connection:
+            connection.execute(
+                sqlalchemy.text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+            )
+            connection.execute(sqlalchemy.text(f'CREATE SCHEMA "{schema}"'))
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        if schema is not None:
+            # Leave nothing behind, just like a serial run only touches the public schema. The pooled connections
+            # were closed above, so none of them holds a lock on the worker's tables anymore
+            with engine.begin() as connection:
+                connection.execute(
+                    sqlalchemy.text(f'DROP SCHEMA IF EXISTS "{schema}" CASCADE')
+                )
+            engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def _schema(engine):
+    """
+    Creates the eflips-model schema, once per test run
+    NOTE: THIS DELETE ALL DATA IN THE DATABASE
+    :param engine: The engine for the test database
+    :return: Nothing
+    """
+    # PostGIS provides the geometry types, btree_gist the exclusion constraint on events. Creating them here (once)
+    # lets the tests run against a freshly created database
+    with engine.begin() as connection:
+        # pytest-xdist workers start at the same time. Concurrent CREATE EXTENSION IF NOT EXISTS statements can still
+        # collide on pg_extension, so the workers take turns. The lock is released at the end of the transaction
+        connection.execute(
+            sqlalchemy.text("SELECT pg_advisory_xact_lock(:key)"),
+            {"key": EXTENSION_LOCK_KEY},
+        )
+        for extension in ("postgis", "btree_gist"):
+            connection.execute(
+                sqlalchemy.text(
+                    f"CREATE EXTENSION IF NOT EXISTS {extension} SCHEMA public"
+                )
+            )
+
+    schema = worker_schema()
+    if schema is None:
+        Base.metadata.drop_all(engine)
+        setup_database(engine)
+    else:
+        # The worker's schema is empty, so the tables are created without looking for existing ones. A lookup would
+        # go through the search path and could find the tables of a serial run in public. For the same reason, the
+        # alembic version table is created in the worker's schema explicitly, instead of through setup_database()
+        with engine.begin() as connection:
+            Base.metadata.create_all(connection, checkfirst=False)
+            migrations = importlib.resources.files("eflips.model").joinpath(
+                "migrations"
+            )
+            migration_context = MigrationContext.configure(
+                connection, opts={"version_table_schema": schema}
+            )
+            migration_context.stamp(ScriptDirectory(str(migrations)), "head")
+
+
+@pytest.fixture()
+def count_queries():
+    """
+    Records the statements a session sends to the database
+    :return: a context manager factory. ``with count_queries(session) as statements:`` collects the SQL of every
+    statement executed by the session's connection inside the block in the ``statements`` list.
+    """
+
+    @contextmanager
+    def counter(session):
+        statements = []
+
+        def record_statement(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        connection = session.connection()
+        event.listen(connection, "before_cursor_execute", record_statement)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", record_statement)
+
+    return counter
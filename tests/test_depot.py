@@ -2,7 +2,9 @@ from datetime import timedelta
 
 import pytest
 import sqlalchemy
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 
 from eflips.model import (
     Area,
@@ -10,7 +12,6 @@ from eflips.model import (
     Depot,
     Plan,
     Process,
-    Scenario,
     VehicleType,
     AssocPlanProcess,
     Station,
@@ -18,30 +19,41 @@ from eflips.model import (
 from tests.test_general import TestGeneral
 
 
+VEHICLE_TYPE_KWARGS = dict(
+    name="Test Vehicle Type 2",
+    battery_capacity=100,
+    charging_curve=[[0, 150], [1, 150]],
+    opportunity_charging_capable=True,
+    consumption=1,
+)
+
+
 class TestDepot(TestGeneral):
     @pytest.fixture()
-    def depot_with_content(self, session, scenario):
-        # Create a simple depot
+    def vehicle_type(self, scenario):
+        """
+        Creates a vehicle type for the areas created in the tests
+        :param scenario: The :class:`Scenario` the vehicle type belongs to
+        :return: A :class:`VehicleType` object
+        """
+        return VehicleType(scenario=scenario, **VEHICLE_TYPE_KWARGS)
+
+    @pytest.fixture()
+    def depot_with_content(self, session, scenario, vehicle_type):
+        # Create a simple depot. Nothing here looks at the station's location, so it is left out
         station = Station(
             scenario=scenario,
             name="Test Station 1",
             name_short="TS1",
-            geom="POINT(0 0 0)",
             is_electrified=False,
         )
-        session.add(station)
 
         depot = Depot(
             scenario=scenario, name="Test Depot", name_short="TD", station=station
         )
-        session.add(depot)
 
         # Create plan
-
         plan = Plan(scenario=scenario, name="Test Plan")
-        session.add(plan)
-
-        depot.default_plan = plan
 
         # Create area
         area = Area(
@@ -51,18 +63,6 @@ class TestDepot(TestGeneral):
             area_type=AreaType.LINE,
             capacity=6,
         )
-        session.add(area)
-
-        # Create vehicle type for area
-        test_vehicle_type = VehicleType(
-            scenario=scenario,
-            name="Test Vehicle Type 2",
-            battery_capacity=100,
-            charging_curve=[[0, 150], [1, 150]],
-            opportunity_charging_capable=True,
-            consumption=1,
-        )
-        area.vehicle_type = test_vehicle_type
 
         # Create processes
         clean = Process(
@@ -79,19 +79,23 @@ class TestDepot(TestGeneral):
             electric_power=150,
         )
 
-        session.add(clean)
-        session.add(charging)
-
-        area.processes.append(clean)
-        area.processes.append(charging)
+        # Wire up the relationships without flushing half-built objects, then insert
+        # everything in a single flush
+        with session.no_autoflush:
+            depot.default_plan = plan
+            area.vehicle_type = vehicle_type
+            area.processes = [clean, charging]
 
-        plan.asssoc_plan_process.append(
-            AssocPlanProcess(scenario=scenario, process=clean, plan=plan, ordinal=1)
-        )
-        plan.asssoc_plan_process.append(
-            AssocPlanProcess(scenario=scenario, process=charging, plan=plan, ordinal=2)
-        )
+            plan.asssoc_plan_process.append(
+                AssocPlanProcess(scenario=scenario, process=clean, plan=plan, ordinal=1)
+            )
+            plan.asssoc_plan_process.append(
+                AssocPlanProcess(
+                    scenario=scenario, process=charging, plan=plan, ordinal=2
+                )
+            )
 
+        session.add_all([station, depot, plan, area, vehicle_type, clean, charging])
         session.commit()
 
         # Test reverse relationships
@@ -105,115 +109,100 @@ class TestDepot(TestGeneral):
 
 
 class TestArea(TestDepot):
-    def test_create_area(self, depot_with_content, session, scenario):
-        vehicle_type = VehicleType(
-            scenario=scenario,
-            name="Test Vehicle Type 2",
-            battery_capacity=100,
-            charging_curve=[[0, 150], [1, 150]],
-            opportunity_charging_capable=True,
-            consumption=1,
-        )
-
-        line_area = Area(
-            scenario=scenario,
-            depot=depot_with_content,
-            name="line area",
-            area_type=AreaType.LINE,
-            capacity=6,
-        )
-
-        session.add(line_area)
-        line_area.vehicle_type = vehicle_type
-
-        direct_twoside_area = Area(
+    @pytest.mark.parametrize(
+        "name,area_type,capacity",
+        [
+            ("line area", AreaType.LINE, 6),
+            ("direct two side Area", AreaType.DIRECT_TWOSIDE, 4),
+            ("direct one side", AreaType.DIRECT_ONESIDE, 7),
+        ],
+    )
+    def test_create_area(
+        self,
+        depot_with_content,
+        session,
+        scenario,
+        vehicle_type,
+        name,
+        area_type,
+        capacity,
+    ):
+        area = Area(
             scenario=scenario,
             depot=depot_with_content,
-            name="direct two side Area",
-            area_type=AreaType.DIRECT_TWOSIDE,
-            capacity=4,
+            name=name,
+            area_type=area_type,
+            capacity=capacity,
         )
-        direct_twoside_area.vehicle_type = vehicle_type
-        session.add(direct_twoside_area)
-
-        direct_oneside_area = Area(
+        session.add(area)
+        area.vehicle_type = vehicle_type
+        session.flush()
+
+    @pytest.mark.parametrize(
+        "name,area_type,capacity",
+        [
+            # Direct area with negative capacity
+            ("Test Area 2", AreaType.DIRECT_ONESIDE, -5),
+            # Direct two-sided area with odd capacity
+            ("Test Area 3", AreaType.DIRECT_TWOSIDE, 17),
+        ],
+    )
+    def test_invalid_area(
+        self,
+        depot_with_content,
+        session,
+        scenario,
+        vehicle_type,
+        name,
+        area_type,
+        capacity,
+    ):
+        area = Area(
             scenario=scenario,
+            name=name,
             depot=depot_with_content,
-            name="direct one side",
-            area_type=AreaType.DIRECT_ONESIDE,
-            capacity=7,
-        )
-        direct_oneside_area.vehicle_type = vehicle_type
-        session.add(direct_oneside_area)
-        session.commit()
-
-    def test_invalid_area(self, depot_with_content, session, scenario):
-        # Test line area with invalid capacity
-
-        vehicle_type = VehicleType(
-            scenario=scenario,
-            name="Test Vehicle Type 2",
-            battery_capacity=100,
-            charging_curve=[[0, 150], [1, 150]],
-            opportunity_charging_capable=True,
+            area_type=area_type,
+            capacity=capacity,
         )
-
-        # Test direct area with negative capacity
-        with pytest.raises(sqlalchemy.exc.IntegrityError):
-            area = Area(
-                scenario=scenario,
-                name="Test Area 2",
-                depot=depot_with_content,
-                area_type=AreaType.DIRECT_ONESIDE,
-                capacity=-5,
-            )
-            session.add(area)
-            area.vehicle_type = vehicle_type
-            session.commit()
-        session.rollback()
-
-        # Test direct area with odd capacity
+        session.add(area)
+        area.vehicle_type = vehicle_type
         with pytest.raises(sqlalchemy.exc.IntegrityError):
-            area = Area(
-                scenario=scenario,
-                name="Test Area 3",
-                depot=depot_with_content,
-                area_type=AreaType.DIRECT_TWOSIDE,
-                capacity=17,
-            )
-            session.add(area)
-            area.vehicle_type = vehicle_type
-            session.commit()
-        session.rollback()
-
-    def test_copy_depot(self, depot_with_content, scenario, session):
-        session.add(depot_with_content)
-        session.commit()
+            session.flush()
 
+    def test_copy_depot(self, depot_with_content, scenario, session, count_queries):
         # Clone the scenario
         scenario_clone = scenario.clone(session)
         session.add(scenario_clone)
         session.commit()
 
-        # Load the depot
-        depot = (
-            session.query(Depot)
-            .join(Scenario)
-            .filter(Depot.scenario == scenario_clone)
-            .one()
-        )
-
-        assert depot.scenario == scenario_clone
-        assert depot.default_plan.scenario == scenario_clone
-
-        for area in depot.areas:
-            assert area.scenario == scenario_clone
-            assert area.vehicle_type.scenario == scenario_clone
-            assert area.depot == depot
-            for process in area.processes:
-                assert process.scenario == scenario_clone
-                for plan in process.plans:
-                    assert plan.scenario == scenario_clone
+        # Load the depot, together with everything the checks below walk over
+        depot = session.execute(
+            select(Depot)
+            .where(Depot.scenario == scenario_clone)
+            .options(
+                joinedload(Depot.default_plan),
+                selectinload(Depot.areas).selectinload(Area.vehicle_type),
+                selectinload(Depot.areas)
+                .selectinload(Area.processes)
+                .selectinload(Process.plans),
+            )
+        ).scalar_one()
+
+        # Everything walked below has been eager-loaded, so any statement emitted
+        # while walking it is a lazy load that slipped through
+        with count_queries(session) as statements:
+            assert depot.scenario == scenario_clone
+            assert depot.default_plan.scenario == scenario_clone
+
+            for area in depot.areas:
+                assert area.scenario == scenario_clone
+                assert area.vehicle_type.scenario == scenario_clone
+                assert area.depot == depot
+                for process in area.processes:
+                    assert process.scenario == scenario_clone
+                    for plan in process.plans:
+                        assert plan.scenario == scenario_clone
+        assert statements == []
 
         session.delete(scenario)
         session.commit()
@@ -232,50 +221,38 @@ class TestArea(TestDepot):
 
 
 class TestProcess(TestGeneral):
-    def test_create_process(self, session, scenario):
-        # create a valid process
-        process = Process(
-            name="Test Process",
-            scenario=scenario,
-            dispatchable=False,
-            duration=timedelta(minutes=30),
-            electric_power=150,
-        )
-
-        session.add(process)
-        session.commit()
-
+    @pytest.mark.parametrize(
+        "name,duration,electric_power",
+        [
+            ("Test Process", timedelta(minutes=30), 150),
+            ("Test Process  number 2", timedelta(minutes=30), None),
+            ("Test Process number 3", None, 150),
+        ],
+    )
+    def test_create_process(self, session, scenario, name, duration, electric_power):
         process = Process(
-            name="Test Process  number 2",
+            name=name,
             scenario=scenario,
             dispatchable=False,
-            duration=timedelta(minutes=30),
+            duration=duration,
+            electric_power=electric_power,
         )
 
         session.add(process)
-        session.commit()
+        session.flush()
 
+    def test_create_invalid_process(self, session, scenario):
+        # test invalid process with negative duration and power
         process = Process(
-            name="Test Process number 3",
+            name="Test Process number 4",
             scenario=scenario,
             dispatchable=False,
-            electric_power=150,
+            duration=timedelta(minutes=-30),
+            electric_power=-150,
         )
         session.add(process)
-        session.commit()
-
-        # test invalid process with negative duration and power
         with pytest.raises(sqlalchemy.exc.IntegrityError):
-            process = Process(
-                name="Test Process number 4",
-                scenario=scenario,
-                dispatchable=False,
-                duration=timedelta(minutes=-30),
-                electric_power=-150,
-            )
-            session.add(process)
-            session.commit()
-        session.rollback()
+            session.flush()
 
     def test_process_plan(self, session, scenario):
         process = Process(
@@ -1,17 +1,15 @@
-import os
 from datetime import datetime, timedelta, timezone
 
 import pytest
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import selectinload, Session
 
 from eflips.model import (
     Area,
     AreaType,
     AssocPlanProcess,
     AssocRouteStation,
-    Base,
     BatteryType,
     Depot,
     Event,
@@ -22,7 +20,6 @@ from eflips.model import (
     Rotation,
     Route,
     Scenario,
-    setup_database,
     Station,
     StopTime,
     Trip,
@@ -38,6 +35,55 @@ from eflips.model.general import (
 )
 
 
+def count_rows(session, *classes):
+    """
+    Counts the rows in the tables of several classes with a single query
+    :param session: An SQLAlchemy Session with the eflips-model schema
+    :param classes: The mapped classes whose tables should be counted
+    :return: A tuple with the number of rows for each class, in the order given
+    """
+    counts = [select(func.count()).select_from(c).scalar_subquery() for c in classes]
+    return tuple(session.execute(select(*counts)).one())
+
+
+def get_plan_process_map(session, scenario):
+    """
+    Loads the associations between plans and processes of a scenario with a single query
+    :param session: An SQLAlchemy Session with the eflips-model schema
+    :param scenario: The :class:`Scenario` to load the associations for
+    :return: A list of (plan name, process name, ordinal) tuples, ordered by ordinal
+    """
+    query = (
+        select(Plan.name, Process.name, AssocPlanProcess.ordinal)
+        .join(AssocPlanProcess.plan)
+        .join(AssocPlanProcess.process)
+        .where(AssocPlanProcess.scenario_id == scenario.id)
+        .order_by(AssocPlanProcess.ordinal)
+    )
+    return [tuple(row) for row in session.execute(query)]
+
+
+def charging_opportunity_kwargs(session, with_vehicle=True):
+    """
+    Loads the objects a charging opportunity event in the sample content refers to
+    :param session: An SQLAlchemy Session with the sample content
+    :param with_vehicle: Whether the event should be assigned to a vehicle
+    :return: A dictionary of keyword arguments for :class:`Event`, without the start and end time
+    """
+    kwargs = dict(
+        scenario=session.query(Scenario).first(),
+        station=session.query(Station).first(),
+        subloc_no=1,
+        vehicle_type=session.query(VehicleType).first(),
+        event_type=EventType.CHARGING_OPPORTUNITY,
+        soc_start=0.5,
+        soc_end=0.5,
+    )
+    if with_vehicle:
+        kwargs["vehicle"] = session.query(Vehicle).first()
+    return kwargs
+
+
 class TestGeneral:
     @pytest.fixture()
     def scenario(self, session):
@@ -122,8 +168,6 @@ class TestGeneral:
         session.add(consumption)
         session.add(vehicle_type)
 
-        session.flush()
-
         # Add a VehicleClass
         vehicle_class = VehicleClass(
             scenario=scenario,
@@ -226,6 +270,7 @@ class TestGeneral:
         )
         interval = timedelta(minutes=30)
         duration = timedelta(minutes=20)
+        to_stop_2 = timedelta(minutes=5)
         trips = []
 
         rotation = Rotation(
@@ -257,9 +302,7 @@ class TestGeneral:
                 StopTime(
                     scenario=scenario,
                     station=stop_2,
-                    arrival_time=first_departure
-                    + 2 * i * interval
-                    + timedelta(minutes=5),
+                    arrival_time=first_departure + 2 * i * interval + to_stop_2,
                 ),
                 StopTime(
                     scenario=scenario,
@@ -289,9 +332,7 @@ class TestGeneral:
                 StopTime(
                     scenario=scenario,
                     station=stop_2,
-                    arrival_time=first_departure
-                    + (2 * i + 1) * interval
-                    + timedelta(minutes=5),
+                    arrival_time=first_departure + (2 * i + 1) * interval + to_stop_2,
                 ),
                 StopTime(
                     scenario=scenario,
@@ -346,8 +387,7 @@ class TestGeneral:
         session.add(clean)
         session.add(charging)
 
-        area.processes.append(clean)
-        area.processes.append(charging)
+        area.processes = [clean, charging]
 
         assocs = [
             AssocPlanProcess(scenario=scenario, process=clean, plan=plan, ordinal=1),
@@ -359,21 +399,24 @@ class TestGeneral:
         return scenario
 
     @pytest.fixture()
-    def session(self):
+    def session(self, engine, _schema):
         """
         Creates a session with the eflips-model schema
-        NOTE: THIS DELETE ALL DATA IN THE DATABASE
+
+        The session runs inside a transaction that is rolled back after the test, so nothing the test does is left
+        in the database. Calls to ``commit()`` and ``rollback()`` in the test only release or roll back a SAVEPOINT.
+
+        :param engine: The engine for the test database
+        :param _schema: Ensures the eflips-model schema has been created
         :return: an SQLAlchemy Session with the eflips-model schema
         """
-        url = os.environ["DATABASE_URL"]
-        engine = create_engine(
-            url, echo=False
-        )  # Change echo to True to see SQL queries
-        Base.metadata.drop_all(engine)
-        setup_database(engine)
-        session = Session(bind=engine)
+        connection = engine.connect()
+        transaction = connection.begin()
+        session = Session(bind=connection, join_transaction_mode="create_savepoint")
         yield session
         session.close()
+        transaction.rollback()
+        connection.close()
 
 
 class TestScenario(TestGeneral):
@@ -382,7 +425,7 @@ class TestScenario(TestGeneral):
         session.add(scenario)
         session.flush()
         session.commit()
-        assert scenario.id == 1
+        assert scenario.id is not None
         assert scenario.name == "Test Scenario"
         assert scenario.created is not None
         assert scenario.finished is None
@@ -390,29 +433,13 @@ class TestScenario(TestGeneral):
         assert isinstance(scenario.simba_options, dict)
 
     def test_copy_scenario(self, session, sample_content):
-        # Find the associations between plans and processes
-        assoc_plan_processes = (
-            session.query(AssocPlanProcess)
-            .filter(AssocPlanProcess.scenario == sample_content)
-            .order_by(AssocPlanProcess.ordinal)
-            .all()
-        )
-
-        assert len(assoc_plan_processes) == 2
         # Remember the name of each plan and process
-        plan_process_map = []
-        for assoc_plan_process in assoc_plan_processes:
-            plan_process_map.append(
-                {
-                    "plan": assoc_plan_process.plan.name,
-                    "process": assoc_plan_process.process.name,
-                    "ordinal": assoc_plan_process.ordinal,
-                }
-            )
+        plan_process_map = get_plan_process_map(session, sample_content)
+        assert len(plan_process_map) == 2
 
         cloned_scenario = sample_content.clone(session)
         # Make sure that all links are also pointing back to the cloned scenario
-        assert cloned_scenario.id == 2
+        assert cloned_scenario.id == sample_content.id + 1
         for vehicle_type in cloned_scenario.vehicle_types:
             assert vehicle_type.scenario == cloned_scenario
             if vehicle_type.battery_type is not None:
@@ -422,104 +449,70 @@ class TestScenario(TestGeneral):
             assert battery_type.scenario == cloned_scenario
 
         # Check the plan process associations
-        assoc_plan_processes = (
-            session.query(AssocPlanProcess)
-            .filter(AssocPlanProcess.scenario == cloned_scenario)
-            .order_by(AssocPlanProcess.ordinal)
-            .all()
-        )
-
-        assert len(assoc_plan_processes) == 2
-        new_plan_process_map = []
-        for assoc_plan_process in assoc_plan_processes:
-            new_plan_process_map.append(
-                {
-                    "plan": assoc_plan_process.plan.name,
-                    "process": assoc_plan_process.process.name,
-                    "ordinal": assoc_plan_process.ordinal,
-                }
-            )
-
-        assert plan_process_map == new_plan_process_map
+        assert get_plan_process_map(session, cloned_scenario) == plan_process_map
 
         # Also check, that the old scenario is still intact
-        # Find the associations between plans and processes
-        assoc_plan_processes = (
-            session.query(AssocPlanProcess)
-            .filter(AssocPlanProcess.scenario == sample_content)
-            .order_by(AssocPlanProcess.ordinal)
-            .all()
-        )
-
-        assert len(assoc_plan_processes) == 2
-        # Remember the name of each plan and process
-        old_plan_process_map = []
-        for assoc_plan_process in assoc_plan_processes:
-            old_plan_process_map.append(
-                {
-                    "plan": assoc_plan_process.plan.name,
-                    "process": assoc_plan_process.process.name,
-                    "ordinal": assoc_plan_process.ordinal,
-                }
-            )
-        assert plan_process_map == old_plan_process_map
+        assert get_plan_process_map(session, sample_content) == plan_process_map
 
         # Make sure the StopTimes are also cloned
-        assert (
-            session.query(StopTime).filter(StopTime.scenario == sample_content).count()
-            == 90
-        )
-        assert (
-            session.query(StopTime).filter(StopTime.scenario == cloned_scenario).count()
-            == 90
+        for scenario in (sample_content, cloned_scenario):
+            query = (
+                select(func.count())
+                .select_from(StopTime)
+                .where(StopTime.scenario_id == scenario.id)
+            )
+            assert session.scalar(query) == 90
+        # None of the cloned stop times may point to a trip or station of another scenario
+        query = (
+            select(func.count())
+            .select_from(StopTime)
+            .join(StopTime.trip)
+            .join(StopTime.station)
+            .where(StopTime.scenario_id == cloned_scenario.id)
+            .where(
+                or_(
+                    Trip.scenario_id != cloned_scenario.id,
+                    Station.scenario_id != cloned_scenario.id,
+                )
+            )
         )
-        for stop_time in session.query(StopTime).filter(
-            StopTime.scenario == cloned_scenario
-        ):
-            assert stop_time.scenario == cloned_scenario
-            assert stop_time.trip.scenario == cloned_scenario
-            assert stop_time.station.scenario == cloned_scenario
+        assert session.scalar(query) == 0
 
         # Make sure the new depot's station entry points to the cloned scenario
         # And the old depot's station entry points to the old scenario
-        for depot in session.query(Depot):
-            assert depot.scenario_id == depot.station.scenario_id
+        query = (
+            select(func.count())
+            .select_from(Depot)
+            .join(Depot.station)
+            .where(Depot.scenario_id != Station.scenario_id)
+        )
+        assert session.scalar(query) == 0
 
     def test_delete_scenario(self, session, sample_content):
         session.delete(sample_content)
         session.commit()
-        assert session.query(Scenario).count() == 0
-        assert session.query(VehicleType).count() == 0
-        assert session.query(BatteryType).count() == 0
+        assert count_rows(session, Scenario, VehicleType, BatteryType) == (0, 0, 0)
 
     def test_delete_child_scenario(self, session, sample_content):
         cloned_scenario = sample_content.clone(session)
-        assert session.query(Scenario).count() == 2
-        assert session.query(VehicleType).count() == 6
-        assert session.query(BatteryType).count() == 2
-        assert session.query(StopTime).count() == 180
+        counts = count_rows(session, Scenario, VehicleType, BatteryType, StopTime)
+        assert counts == (2, 6, 2, 180)
         session.delete(cloned_scenario)
         session.commit()
-        assert session.query(Scenario).count() == 1
-        assert session.query(VehicleType).count() == 3
-        assert session.query(BatteryType).count() == 1
-        assert session.query(StopTime).count() == 90
+        counts = count_rows(session, Scenario, VehicleType, BatteryType, StopTime)
+        assert counts == (1, 3, 1, 90)
 
     def test_delete_parent_scenario(self, session, sample_content):
         cloned_scenario = sample_content.clone(session)
-        assert session.query(Scenario).count() == 2
-        assert session.query(VehicleType).count() == 6
-        assert session.query(BatteryType).count() == 2
-        assert session.query(StopTime).count() == 180
+        counts = count_rows(session, Scenario, VehicleType, BatteryType, StopTime)
+        assert counts == (2, 6, 2, 180)
 
         # For some reason, we need to commit the child scenario first
         session.commit()
         session.delete(sample_content)
 
-        assert session.query(Scenario).count() == 1
-        assert session.query(VehicleType).count() == 3
-        assert session.query(BatteryType).count() == 1
-        assert session.query(StopTime).count() == 90
+        counts = count_rows(session, Scenario, VehicleType, BatteryType, StopTime)
+        assert counts == (1, 3, 1, 90)
 
     def test_create_scenario_with_parent(self, session):
         parent = Scenario(name="Parent Scenario")
@@ -528,14 +521,14 @@ class TestScenario(TestGeneral):
         scenario = Scenario(name="Child Scenario", parent=parent)
         session.add(scenario)
         session.commit()
-        assert scenario.id == 2
+        assert scenario.id == parent.id + 1
         assert scenario.name == "Child Scenario"
         assert scenario.created is not None
         assert scenario.finished is None
         assert scenario.simba_options is not None
         assert isinstance(scenario.simba_options, dict)
         assert scenario.parent == parent
-        assert scenario.parent_id == 1
+        assert scenario.parent_id == parent.id
         assert parent.children == [scenario]
 
     def test_select_rotations(self, session, sample_content):
@@ -635,20 +628,21 @@ class TestVehicleType(TestGeneral):
         session.add(vehicle_type)
         session.commit()
 
-    def test_create_vehicle_type_invalid_battery_capacity(self, scenario, session):
-        for battery_capacity in [-100, 0]:
-            with pytest.raises(sqlalchemy.exc.IntegrityError):
-                vehicle_type = VehicleType(
-                    name="Test Vehicle Type",
-                    scenario=scenario,
-                    battery_capacity=battery_capacity,
-                    charging_curve=[[0, 150], [1, 150]],
-                    opportunity_charging_capable=True,
-                    consumption=1,
-                )
-                session.add(vehicle_type)
-                session.commit()
-            session.rollback()
+    @pytest.mark.parametrize("battery_capacity", [-100, 0])
+    def test_create_vehicle_type_invalid_battery_capacity(
+        self, scenario, session, battery_capacity
+    ):
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            vehicle_type = VehicleType(
+                name="Test Vehicle Type",
+                scenario=scenario,
+                battery_capacity=battery_capacity,
+                charging_curve=[[0, 150], [1, 150]],
+                opportunity_charging_capable=True,
+                consumption=1,
+            )
+            session.add(vehicle_type)
+            session.flush()
 
     def test_create_vehicle_type_invalid_battery_capacity_reserve(
         self, scenario, session
@@ -680,21 +674,22 @@ class TestVehicleType(TestGeneral):
         session.add(vehicle_type)
         session.commit()
 
-    def test_create_vehicle_type_invalid_charging_efficiency(self, scenario, session):
-        for charging_efficiency in (-1, 0, 1.1):
-            with pytest.raises(sqlalchemy.exc.IntegrityError):
-                vehicle_type = VehicleType(
-                    name="Test Vehicle Type",
-                    scenario=scenario,
-                    battery_capacity=100,
-                    charging_curve=[[0, 150], [1, 150]],
-                    charging_efficiency=charging_efficiency,
-                    opportunity_charging_capable=True,
-                    consumption=1,
-                )
-                session.add(vehicle_type)
-                session.commit()
-            session.rollback()
+    @pytest.mark.parametrize("charging_efficiency", [-1, 0, 1.1])
+    def test_create_vehicle_type_invalid_charging_efficiency(
+        self, scenario, session, charging_efficiency
+    ):
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            vehicle_type = VehicleType(
+                name="Test Vehicle Type",
+                scenario=scenario,
+                battery_capacity=100,
+                charging_curve=[[0, 150], [1, 150]],
+                charging_efficiency=charging_efficiency,
+                opportunity_charging_capable=True,
+                consumption=1,
+            )
+            session.add(vehicle_type)
+            session.flush()
 
     def test_create_vehicle_type_invalid_minimum_charging_power(
         self, scenario, session
@@ -712,21 +707,22 @@ class TestVehicleType(TestGeneral):
             session.add(vehicle_type)
             session.commit()
 
-    def test_create_vehicle_type_invalid_empty_weight(self, scenario, session):
-        for empty_weight in (-100, 0):
-            with pytest.raises(sqlalchemy.exc.IntegrityError):
-                vehicle_type = VehicleType(
-                    name="Test Vehicle Type",
-                    scenario=scenario,
-                    battery_capacity=100,
-                    charging_curve=[[0, 150], [1, 150]],
-                    opportunity_charging_capable=True,
-                    empty_mass=empty_weight,
-                    consumption=1,
-                )
-                session.add(vehicle_type)
-                session.commit()
-            session.rollback()
+    @pytest.mark.parametrize("empty_weight", [-100, 0])
+    def test_create_vehicle_type_invalid_empty_weight(
+        self, scenario, session, empty_weight
+    ):
+        with pytest.raises(sqlalchemy.exc.IntegrityError):
+            vehicle_type = VehicleType(
+                name="Test Vehicle Type",
+                scenario=scenario,
+                battery_capacity=100,
+                charging_curve=[[0, 150], [1, 150]],
+                opportunity_charging_capable=True,
+                empty_mass=empty_weight,
+                consumption=1,
+            )
+            session.add(vehicle_type)
+            session.flush()
 
 
 class TestBatteryType(TestGeneral):
@@ -821,13 +817,14 @@ class TestVehicleClass(TestGeneral):
 class TestEvent(TestGeneral):
     def test_create_driving_event_simple(self, session, sample_content):
         # Create a driving event on the first trip
+        trip = session.query(Trip).first()
         event = Event(
             scenario=session.query(Scenario).first(),
-            trip=session.query(Trip).first(),
+            trip=trip,
             vehicle_type=session.query(VehicleType).first(),
             event_type=EventType.DRIVING,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
+            time_start=trip.departure_time,
+            time_end=trip.arrival_time,
             soc_start=0.5,
             soc_end=0.5,
         )
@@ -835,21 +832,24 @@ class TestEvent(TestGeneral):
         session.commit()
 
     def test_create_charging_opportunity(self, session, sample_content):
+        trip = session.query(Trip).first()
         event = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
-            soc_start=0.5,
-            soc_end=0.5,
+            **charging_opportunity_kwargs(session, with_vehicle=False),
+            time_start=trip.departure_time,
+            time_end=trip.arrival_time,
         )
         session.add(event)
         session.commit()
 
     def test_create_invalid_event_type_combination(self, session, sample_content):
+        # Load everything the events refer to once, instead of in every iteration
+        scenario = session.query(Scenario).first()
+        station = session.query(Station).first()
+        area = session.query(Area).first()
+        vehicle_type = session.query(VehicleType).first()
+        trip = session.query(Trip).first()
+        time_start, time_end = trip.departure_time, trip.arrival_time
+
         # At a station it can only be CHARGING_OPPORTUNITY
         for event_type in (
             EventType.DRIVING,
@@ -857,21 +857,21 @@ class TestEvent(TestGeneral):
             EventType.SERVICE,
             EventType.PRECONDITIONING,
         ):
-            event = Event(
-                scenario=session.query(Scenario).first(),
-                station=session.query(Station).first(),
-                subloc_no=1,
-                vehicle_type=session.query(VehicleType).first(),
-                event_type=event_type,
-                time_start=session.query(Trip).first().departure_time,
-                time_end=session.query(Trip).first().arrival_time,
-                soc_start=0.5,
-                soc_end=0.5,
-            )
-            session.add(event)
             with pytest.raises(sqlalchemy.exc.IntegrityError):
-                session.commit()
-            session.rollback()
+                with session.begin_nested():
+                    event = Event(
+                        scenario=scenario,
+                        station=station,
+                        subloc_no=1,
+                        vehicle_type=vehicle_type,
+                        event_type=event_type,
+                        time_start=time_start,
+                        time_end=time_end,
+                        soc_start=0.5,
+                        soc_end=0.5,
+                    )
+                    session.add(event)
+                    session.flush()
 
         # At a trip it can only be DRIVING
         for event_type in (
@@ -881,260 +881,169 @@ class TestEvent(TestGeneral):
             EventType.STANDBY_DEPARTURE,
             EventType.PRECONDITIONING,
         ):
-            event = Event(
-                scenario=session.query(Scenario).first(),
-                trip=session.query(Trip).first(),
-                vehicle_type=session.query(VehicleType).first(),
-                event_type=event_type,
-                time_start=session.query(Trip).first().departure_time,
-                time_end=session.query(Trip).first().arrival_time,
-                soc_start=0.5,
-                soc_end=0.5,
-            )
-            session.add(event)
             with pytest.raises(sqlalchemy.exc.IntegrityError):
-                session.commit()
-            session.rollback()
+                with session.begin_nested():
+                    event = Event(
+                        scenario=scenario,
+                        trip=trip,
+                        vehicle_type=vehicle_type,
+                        event_type=event_type,
+                        time_start=time_start,
+                        time_end=time_end,
+                        soc_start=0.5,
+                        soc_end=0.5,
+                    )
+                    session.add(event)
+                    session.flush()
 
         # At a depot's area it can only be CHARGING_DEPOT, SERVICE, STANDBY_DEPARTURE or PRECONDITIONING
         for event_type in (
             EventType.DRIVING,
             EventType.CHARGING_OPPORTUNITY,
         ):
-            event = Event(
-                scenario=session.query(Scenario).first(),
-                area=session.query(Area).first(),
-                vehicle_type=session.query(VehicleType).first(),
-                event_type=event_type,
-                time_start=session.query(Trip).first().departure_time,
-                time_end=session.query(Trip).first().arrival_time,
-            )
-            session.add(event)
             with pytest.raises(sqlalchemy.exc.IntegrityError):
-                session.commit()
-            session.rollback()
-
-    def test_create_charging_depot(self, session, sample_content):
+                with session.begin_nested():
+                    event = Event(
+                        scenario=scenario,
+                        area=area,
+                        vehicle_type=vehicle_type,
+                        event_type=event_type,
+                        time_start=time_start,
+                        time_end=time_end,
+                    )
+                    session.add(event)
+                    session.flush()
+
+    def test_create_charging_depot(self, session, sample_content, count_queries):
         # Find the charging process
         charging_process = (
             session.query(Process)
+            .options(selectinload(Process.areas).joinedload(Area.depot))
             .filter(Process.electric_power > 0)
             .filter(Process.duration == None)
             .first()
         )
+        # The area and its depot are eager loaded, so reaching the station must not hit the database
+        with count_queries(session) as statements:
+            area = charging_process.areas[0]
+            station_id = area.depot.station_id
+        assert statements == []
+        trip = session.query(Trip).first()
 
         event = Event(
             scenario=session.query(Scenario).first(),
-            area=charging_process.areas[0],
-            station_id=charging_process.areas[0].depot.station_id,
+            area=area,
+            station_id=station_id,
             vehicle_type=session.query(VehicleType).first(),
             event_type=EventType.CHARGING_DEPOT,
             subloc_no=1,
             soc_start=0.5,
             soc_end=0.5,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
+            time_start=trip.departure_time,
+            time_end=trip.arrival_time,
         )
         session.add(event)
         session.commit()
 
     def test_create_overlapping_events_should_work(self, session, sample_content):
-        # Overlapping events for the same type are allowed, since that may very well be different vehicles
-        event_1 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
-            soc_start=0.5,
-            soc_end=0.5,
-        )
+        kwargs = charging_opportunity_kwargs(session, with_vehicle=False)
+        trip = session.query(Trip).first()
+        time_start, time_end = trip.departure_time, trip.arrival_time
 
+        # Overlapping events for the same type are allowed, since that may very well be different vehicles
+        event_1 = Event(**kwargs, time_start=time_start, time_end=time_end)
         event_2 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().arrival_time - timedelta(minutes=10),
-            time_end=session.query(Trip).first().arrival_time + timedelta(minutes=10),
-            soc_start=0.5,
-            soc_end=0.5,
+            **kwargs,
+            time_start=time_end - timedelta(minutes=10),
+            time_end=time_end + timedelta(minutes=10),
         )
 
-        session.add(event_1)
-        session.add(event_2)
+        session.add_all([event_1, event_2])
         session.commit()
 
     def test_create_truly_overlapping_events(self, session, sample_content):
-        # Creating an event which ends after the next event starts should not be allowed
-        event_1 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
-            soc_start=0.5,
-            soc_end=0.5,
-        )
+        kwargs = charging_opportunity_kwargs(session)
+        trip = session.query(Trip).first()
+        time_start, time_end = trip.departure_time, trip.arrival_time
 
+        # Creating an event which ends after the next event starts should not be allowed
+        event_1 = Event(**kwargs, time_start=time_start, time_end=time_end)
         event_2 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().arrival_time - timedelta(minutes=10),
-            time_end=session.query(Trip).first().arrival_time + timedelta(minutes=10),
-            soc_start=0.5,
-            soc_end=0.5,
+            **kwargs,
+            time_start=time_end - timedelta(minutes=10),
+            time_end=time_end + timedelta(minutes=10),
         )
 
-        session.add(event_1)
-        session.add(event_2)
+        session.add_all([event_1, event_2])
 
         with pytest.raises(sqlalchemy.exc.IntegrityError):
             session.commit()
         session.rollback()
 
         # Also create an event wholly contained within another event
-        event_1 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
-            soc_start=0.5,
-            soc_end=0.5,
-        )
-
+        event_1 = Event(**kwargs, time_start=time_start, time_end=time_end)
         event_2 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time
-            + timedelta(minutes=1),
-            time_end=session.query(Trip).first().arrival_time - timedelta(minutes=1),
-            soc_start=0.5,
-            soc_end=0.5,
+            **kwargs,
+            time_start=time_start + timedelta(minutes=1),
+            time_end=time_end - timedelta(minutes=1),
         )
 
-        session.add(event_1)
-        session.add(event_2)
+        session.add_all([event_1, event_2])
 
         with pytest.raises(sqlalchemy.exc.IntegrityError):
             session.commit()
         session.rollback()
 
     def test_create_overlapping_events(self, session, sample_content):
-        # Creating an event with its start time being exactly the same as the end time of another event should not be allowed
-        event_1 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time,
-            soc_start=0.5,
-            soc_end=0.5,
-        )
+        kwargs = charging_opportunity_kwargs(session)
+        trip = session.query(Trip).first()
+        time_start, time_end = trip.departure_time, trip.arrival_time
 
+        # Creating an event with its start time being exactly the same as the end time of another event should not be allowed
+        event_1 = Event(**kwargs, time_start=time_start, time_end=time_end)
         event_2 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().arrival_time,
-            time_end=session.query(Trip).first().arrival_time + timedelta(minutes=10),
-            soc_start=0.5,
-            soc_end=0.5,
+            **kwargs, time_start=time_end, time_end=time_end + timedelta(minutes=10)
         )
 
-        session.add(event_1)
-        session.add(event_2)
+        session.add_all([event_1, event_2])
         session.commit()
 
         # Howeever, if we move the end of the first event forward by even one microsecond, it should not be allowed
         event_3 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().departure_time,
-            time_end=session.query(Trip).first().arrival_time
-            + timedelta(microseconds=1),
-            soc_start=0.5,
-            soc_end=0.5,
+            **kwargs,
+            time_start=time_start,
+            time_end=time_end + timedelta(microseconds=1),
         )
-
         event_4 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().arrival_time,
-            time_end=session.query(Trip).first().arrival_time + timedelta(minutes=10),
-            soc_start=0.5,
-            soc_end=0.5,
+            **kwargs, time_start=time_end, time_end=time_end + timedelta(minutes=10)
         )
 
-        session.add(event_3)
-        session.add(event_4)
+        session.add_all([event_3, event_4])
         with pytest.raises(sqlalchemy.exc.IntegrityError):
-            session.commit()
+            session.flush()
 
     def test_create_negative_event(self, session, sample_content):
+        trip = session.query(Trip).first()
+
         # An event with a negative duration should not be allowed
         event_1 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().arrival_time,
-            time_end=session.query(Trip).first().departure_time,
-            soc_start=0.5,
-            soc_end=0.5,
+            **charging_opportunity_kwargs(session),
+            time_start=trip.arrival_time,
+            time_end=trip.departure_time,
         )
         session.add(event_1)
         with pytest.raises(sqlalchemy.exc.IntegrityError):
-            session.commit()
+            session.flush()
 
     def test_create_zero_event(self, session, sample_content):
+        trip = session.query(Trip).first()
+
         # An event with a negative duration should not be allowed
         event_1 = Event(
-            scenario=session.query(Scenario).first(),
-            station=session.query(Station).first(),
-            subloc_no=1,
-            vehicle_type=session.query(VehicleType).first(),
-            vehicle=session.query(Vehicle).first(),
-            event_type=EventType.CHARGING_OPPORTUNITY,
-            time_start=session.query(Trip).first().arrival_time,
-            time_end=session.query(Trip).first().arrival_time,
-            soc_start=0.5,
-            soc_end=0.5,
+            **charging_opportunity_kwargs(session),
+            time_start=trip.arrival_time,
+            time_end=trip.arrival_time,
         )
         session.add(event_1)
         with pytest.raises(sqlalchemy.exc.IntegrityError):
-            session.commit()
+            session.flush()
@@ -1,14 +1,98 @@
 import pickle
 
-from eflips.model import Base
+import pytest
+from sqlalchemy import func, or_, select
+
+from eflips.model import (
+    Base,
+    BatteryType,
+    ConsumptionLut,
+    Scenario,
+    Station,
+    StopTime,
+    Temperatures,
+    Trip,
+    VehicleType,
+)
+from eflips.model.depot import Area, AssocAreaProcess
+from eflips.model.general import AssocVehicleTypeVehicleClass
 from eflips.model.util.export import (
+    ALL_CLASSES_WITH_SCENARIO_ID,
     extract_scenario,
     start_counting_foreign_keys_at,
     get_or_update_max_sequence_number,
+    insert_objects,
+    open_scenario_file,
+    ZSTD_MAGIC_NUMBER,
 )
 from test_general import TestGeneral
 
 
+def get_scenario_contents(session, scenario_id):
+    """
+    Summarizes the contents of a scenario in a form that does not depend on the ids of the objects
+    :param session: An SQLAlchemy Session with the eflips-model schema
+    :param scenario_id: The id of the scenario to summarize
+    :return: A dictionary with the number of rows per table and the values of some columns of each column type
+    """
+    contents = {}
+    for cls in ALL_CLASSES_WITH_SCENARIO_ID:
+        query = (
+            select(func.count()).select_from(cls).where(cls.scenario_id == scenario_id)
+        )
+        contents[cls.__name__] = session.scalar(query)
+
+    # The pure association tables have no scenario_id
+    contents["AssocAreaProcess"] = session.scalar(
+        select(func.count())
+        .select_from(AssocAreaProcess)
+        .join(Area, AssocAreaProcess.area_id == Area.id)
+        .where(Area.scenario_id == scenario_id)
+    )
+    contents["AssocVehicleTypeVehicleClass"] = session.scalar(
+        select(func.count())
+        .select_from(AssocVehicleTypeVehicleClass)
+        .join(
+            VehicleType, AssocVehicleTypeVehicleClass.vehicle_type_id == VehicleType.id
+        )
+        .where(VehicleType.scenario_id == scenario_id)
+    )
+
+    queries = {
+        # Geometry
+        "stations": select(Station.name, func.ST_AsText(Station.geom))
+        .where(Station.scenario_id == scenario_id)
+        .order_by(Station.name),
+        # ARRAY
+        "vehicle_types": select(
+            VehicleType.name, VehicleType.empty_mass, VehicleType.charging_curve
+        )
+        .where(VehicleType.scenario_id == scenario_id)
+        .order_by(VehicleType.name, VehicleType.empty_mass),
+        "temperatures": select(Temperatures.datetimes, Temperatures.data).where(
+            Temperatures.scenario_id == scenario_id
+        ),
+        # JSONB
+        "battery_types": select(BatteryType.chemistry).where(
+            BatteryType.scenario_id == scenario_id
+        ),
+        "consumption_luts": select(
+            ConsumptionLut.columns, ConsumptionLut.data_points, ConsumptionLut.values
+        ).where(ConsumptionLut.scenario_id == scenario_id),
+        # Enum
+        "trips": select(Trip.trip_type, Trip.departure_time, Trip.arrival_time)
+        .where(Trip.scenario_id == scenario_id)
+        .order_by(Trip.departure_time),
+        # Interval
+        "stop_times": select(StopTime.arrival_time, StopTime.dwell_duration)
+        .where(StopTime.scenario_id == scenario_id)
+        .order_by(StopTime.arrival_time),
+    }
+    for name, query in queries.items():
+        contents[name] = [tuple(row) for row in session.execute(query)]
+    return contents
+
+
 class TestExport(TestGeneral):
     def test_export_reimport(self, session, scenario, tmp_path):
         scenario_ids = [scenario.id]
@@ -51,10 +135,7 @@ class TestExport(TestGeneral):
         all_objects = start_counting_foreign_keys_at(starts, all_objects)
 
         # Put the objects into the database
-        with session.no_autoflush:
-            for obj in all_objects:
-                session.add(obj)
-        session.flush()
+        insert_objects(session, all_objects)
 
         # Update the sequence numbers in the database
         get_or_update_max_sequence_number(
@@ -66,3 +147,63 @@ class TestExport(TestGeneral):
 
         # Verify that now there are two scenarios in the database
         assert session.query(scenario.__class__).count() == 2
+
+    def test_export_reimport_sample_content(self, session, sample_content):
+        # extract_scenario() detaches the scenario, so remember its id first
+        scenario_id = sample_content.id
+        contents = get_scenario_contents(session, scenario_id)
+
+        all_objects = extract_scenario(scenario_id, session)
+        all_objects = pickle.loads(pickle.dumps(all_objects))
+
+        starts = get_or_update_max_sequence_number(session.connection().connection.driver_connection, do_update=False)  # type: ignore
+        all_objects = start_counting_foreign_keys_at(starts, all_objects)
+        insert_objects(session, all_objects)
+        get_or_update_max_sequence_number(
+            session.connection().connection.driver_connection,  # type: ignore
+            do_update=True,
+        )
+        session.commit()
+
+        imported_scenario = next(
+            obj for obj in all_objects if isinstance(obj, Scenario)
+        )
+        imported_id = imported_scenario.__dict__["id"]
+        assert imported_id != scenario_id
+        assert get_scenario_contents(session, imported_id) == contents
+
+        # The foreign keys of the imported rows must point into the imported scenario
+        query = (
+            select(func.count())
+            .select_from(StopTime)
+            .join(Trip, StopTime.trip_id == Trip.id)
+            .join(Station, StopTime.station_id == Station.id)
+            .where(StopTime.scenario_id == imported_id)
+            .where(
+                or_(Trip.scenario_id != imported_id, Station.scenario_id != imported_id)
+            )
+        )
+        assert session.scalar(query) == 0
+
+
+@pytest.mark.parametrize("file_name", ["scenario.pkl.gz", "scenario.pkl.zst"])
+def test_open_scenario_file_round_trip(tmp_path, file_name):
+    use_zstd = file_name.endswith(".zst")
+    if use_zstd:
+        pytest.importorskip("zstandard")
+
+    to_dump = {"alembic_version": "0123456789ab", "objects": list(range(10000))}
+    with open_scenario_file(str(tmp_path / file_name), write=True) as file:
+        pickle.dump(to_dump, file)
+
+    magic = (tmp_path / file_name).read_bytes()[: len(ZSTD_MAGIC_NUMBER)]
+    if use_zstd:
+        assert magic == ZSTD_MAGIC_NUMBER
+    else:
+        assert magic[:2] == b"\x1f\x8b"  # gzip
+
+    # When reading, the compression is detected from the content, not from the file name
+    renamed = tmp_path / "scenario.pkl"
+    (tmp_path / file_name).rename(renamed)
+    with open_scenario_file(str(renamed)) as file:
+        assert pickle.load(file) == to_dump